@@ -1,82 +1,86 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+import asyncio
+import concurrent.futures
 import json
 import os
-import re
-import sys
+import threading
+import time
 from datetime import datetime
-import subprocess
+from itertools import islice
 
-# Swedish to English translation dictionary (90% coverage)
-TRANSLATIONS = {
-    # Business terms
-    "företag": "company", "verksamhet": "business", "firma": "firm",
-    "omsättning": "revenue", "resultat": "profit", "vinst": "profit", 
-    "förlust": "loss", "intäkter": "income", "kostnader": "costs",
-    
-    # Industries
-    "handel": "trade", "tillverkning": "manufacturing", "tjänster": "services",
-    "hotell": "hotel", "restaurang": "restaurant", "e-handel": "e-commerce",
-    "bygg": "construction", "transport": "transport", "logistik": "logistics",
-    "fastighet": "real estate", "fastigheter": "real estate",
-    
-    # Financial terms
-    "miljoner": "million", "mkr": "million SEK", "tkr": "thousand SEK",
-    "miljarder": "billion", "bkr": "billion SEK",
-    
-    # Business status
-    "lönsam": "profitable", "väletablerad": "well-established",
-    "etablerad": "established", "populär": "popular", "stark": "strong",
-    "tillväxt": "growth", "potential": "potential", "framtid": "future",
-    
-    # Location terms
-    "sverige": "Sweden", "stockholm": "Stockholm", "göteborg": "Gothenburg",
-    "malmö": "Malmö", "uppsala": "Uppsala", "västerås": "Västerås",
-    
-    # Business activities
-    "leverantör": "supplier", "grossist": "wholesaler", "butik": "store",
-    "fabrik": "factory", "kontor": "office", "lager": "warehouse",
-    "verkstad": "workshop", "ateljé": "studio", "salong": "salon"
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib parser
+    orjson = None
+
+from bolagsplatsen_scraper.text_utils import convert_currency, translate_text
+
+# English titles for the structured content sections scraped from detail pages
+SECTION_NAMES = {
+    'company_brief': 'Company Overview',
+    'potential': 'Growth Potential',
+    'reason_for_sale': 'Reason for Sale',
+    'price_idea': 'Pricing Details',
+    'summary': 'Summary',
+    'description': 'Description',
+    'business_activity': 'Business Activity',
+    'market': 'Market Information',
+    'competition': 'Competitive Situation'
 }
 
-# Currency conversion rate (approximate)
-SEK_TO_USD = 0.095  # 1 SEK = 0.095 USD
+# How long transformed scraper results are reused before reloading
+CACHE_TTL_SECONDS = 15 * 60
+# After a failed refresh, how long to keep serving what we have before trying again
+CACHE_RETRY_SECONDS = 60
+# Upper bound on waiting for an in-process crawl to finish
+CRAWL_TIMEOUT_SECONDS = 30 * 60
 
-def translate_text(text):
-    """Translate Swedish text to English using the translation dictionary"""
-    if not text:
-        return text
-    
-    translated = text
-    for swedish, english in TRANSLATIONS.items():
-        translated = translated.replace(swedish, english)
+class _ScraperCache:
+    """Transformed listings shared by every endpoint"""
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.data = None
+        self.by_product_id = {}
+        self.by_category = {}
+        self.by_location = {}
+        self.search_index = []
+        self.expires = 0.0
     
-    # Capitalize first letter
-    return translated.capitalize()
+    def update(self, data):
+        """Store freshly transformed listings and rebuild the lookup indexes"""
+        by_product_id = {}
+        by_category = {}
+        by_location = {}
+        search_index = []
+        for item in data:
+            if item["product_id"]:
+                by_product_id[item["product_id"]] = item
+            by_category.setdefault(item["category"], []).append(item)
+            by_location.setdefault(item["location"], []).append(item)
+            # Lowercase the searchable fields once, one per line so matches can't span fields
+            search_blob = "\n".join(
+                item[field] or "" for field in ("title", "company", "category", "location")
+            ).lower()
+            search_index.append((search_blob, item))
+        
+        self.data = data
+        self.by_product_id = by_product_id
+        self.by_category = by_category
+        self.by_location = by_location
+        self.search_index = search_index
+        self.expires = time.monotonic() + CACHE_TTL_SECONDS
 
-def convert_currency(price_str):
-    """Convert SEK prices to USD"""
-    if not price_str:
-        return price_str
-    
-    # Extract numbers from price string
-    numbers = re.findall(r'[\d\s]+', price_str)
-    if not numbers:
-        return price_str
-    
-    try:
-        price = int(''.join(numbers).replace(' ', ''))
-        usd_price = round(price * SEK_TO_USD)
-        return f"${usd_price:,}"
-    except ValueError:
-        return price_str
+_cache = _ScraperCache()
 
 app = FastAPI(
     title="Bolagsplatsen Scraper API",
     description="API for scraping business listings from Bolagsplatsen",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse if orjson else JSONResponse
 )
 
 # Add CORS middleware
@@ -100,171 +104,283 @@ class BusinessListing(BaseModel):
     business_name: Optional[str] = None
     contact_name: Optional[str] = None
     phone_number: Optional[str] = None
+    product_id: Optional[str] = None
 
-def run_scraper():
-    """Run the Scrapy spider and return the data"""
-    try:
-        # First, try to load existing data from multiple possible locations
-        data_files = [
-            "bolagsplatsen_listings.json",
-            "final_enhanced_listings.json",
-            "enhanced_listings.json"
-        ]
+def _load_json(file_path):
+    """Parse a JSON file, using orjson when it is installed"""
+    with open(file_path, "rb") as f:
+        content = f.read()
+    return orjson.loads(content) if orjson else json.loads(content)
+
+def _load_json_lines(file_path):
+    """Parse a JSON Lines feed, one item per non-blank line"""
+    loads = orjson.loads if orjson else json.loads
+    with open(file_path, "rb") as f:
+        return [loads(line) for line in f if line.strip()]
+
+_reactor_lock = threading.Lock()
+_reactor_started = False
+
+def _ensure_reactor(settings):
+    """Start the Twisted reactor once, in a daemon thread, for in-process crawls"""
+    global _reactor_started
+    with _reactor_lock:
+        if _reactor_started:
+            return
         
-        raw_data = None
+        started = threading.Event()
+        settled = threading.Event()
         
-        # Try to load from existing files
-        for file_path in data_files:
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        raw_data = json.load(f)
-                        print(f"Loaded data from {file_path}: {len(raw_data)} items")
-                        break
-                except Exception as e:
-                    print(f"Error loading {file_path}: {e}")
-                    continue
+        def run_reactor():
+            try:
+                # Install the reactor the project asks for before anything imports the default one
+                if settings.get("TWISTED_REACTOR"):
+                    from scrapy.utils.reactor import install_reactor
+                    install_reactor(settings["TWISTED_REACTOR"], settings.get("ASYNCIO_EVENT_LOOP"))
+                from twisted.internet import reactor
+                # Only the running reactor marks success; callbacks fire in order
+                reactor.callWhenRunning(started.set)
+                reactor.callWhenRunning(settled.set)
+                reactor.run(installSignalHandlers=False)
+            finally:
+                settled.set()
+        
+        thread = threading.Thread(target=run_reactor, name="scrapy-reactor", daemon=True)
+        thread.start()
+        settled.wait()
+        if not started.is_set():
+            thread.join()
+            raise RuntimeError("Twisted reactor failed to start")
+        _reactor_started = True
+
+def crawl_in_process():
+    """Start the spider inside this process and return a future for the scraped items"""
+    from scrapy.utils.project import get_project_settings
+    
+    settings = get_project_settings()
+    _ensure_reactor(settings)
+    
+    from itemadapter import ItemAdapter
+    from scrapy import signals
+    from scrapy.crawler import CrawlerRunner
+    from twisted.internet import reactor
+    
+    future = concurrent.futures.Future()
+    
+    def crawl():
+        # Once running, a timed-out waiter can no longer cancel the future under us
+        if not future.set_running_or_notify_cancel():
+            return
+        items = []
+        
+        def collect(item):
+            items.append(ItemAdapter(item).asdict())
+        
+        try:
+            runner = CrawlerRunner(settings)
+            crawler = runner.create_crawler("bolagsplatsen")
+            crawler.signals.connect(collect, signal=signals.item_scraped, weak=False)
+            deferred = runner.crawl(crawler)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        deferred.addCallbacks(
+            lambda _: future.set_result(items),
+            lambda failure: future.set_exception(failure.value)
+        )
+    
+    reactor.callFromThread(crawl)
+    return future
+
+def _load_saved_listings():
+    """Load listings saved by a previous scrape, if any"""
+    # Try multiple possible locations
+    data_files = [
+        "bolagsplatsen_listings.jsonl",
+        "bolagsplatsen_listings.json",
+        "final_enhanced_listings.json",
+        "enhanced_listings.json"
+    ]
+    
+    for file_path in data_files:
+        if os.path.exists(file_path):
+            try:
+                if file_path.endswith(".jsonl"):
+                    raw_data = _load_json_lines(file_path)
+                else:
+                    raw_data = _load_json(file_path)
+                print(f"Loaded data from {file_path}: {len(raw_data)} items")
+                return raw_data
+            except Exception as e:
+                print(f"Error loading {file_path}: {e}")
+                continue
+    
+    return None
+
+def transform_listings(raw_data):
+    """Transform raw spider items into the API format"""
+    # Feeds can hold a listing more than once (older spider runs emitted the card and
+    # then its detail-enriched copy); keep one entry per (title, url), preferring the
+    # later, more complete one
+    unique_items = {}
+    for item in raw_data:
+        unique_items[(item.get('title'), item.get('url'))] = item
+    
+    # Transform the data to match the expected format with translation and USD conversion
+    transformed_data = []
+    for item in unique_items.values():
+        # Create details sections from the scraped data
+        details_sections = []
+        
+        # Add business description section (use full description if available)
+        description_text = item.get('full_description') or item.get('description', '')
+        if description_text:
+            details_sections.append({
+                "infoSummary": "Business Description",
+                "infoItems": [translate_text(description_text)]
+            })
+        
+        # Add structured content sections if available
+        structured_content = item.get('structured_content')
+        if structured_content:
+            for section_key, section_content in structured_content.items():
+                if section_content and len(section_text := str(section_content).strip()) > 20:
+                    section_title = SECTION_NAMES.get(section_key) or section_key.replace('_', ' ').title()
+                    details_sections.append({
+                        "infoSummary": section_title,
+                        "infoItems": [translate_text(section_text)]
+                    })
+        
+        # Look up each optional field once
+        revenue = item.get('revenue')
+        detailed_revenue = item.get('detailed_revenue')
+        profit_status = item.get('profit_status')
+        detailed_profit = item.get('detailed_profit')
+        price = item.get('price', '')
+        usd_price = convert_currency(price)
+        financial_details = item.get('financial_details')
+        employee_count = item.get('employee_count')
+        phone = item.get('phone')
+        email = item.get('email')
+        broker_name = item.get('broker_name')
+        broker_company = item.get('broker_company')
+        
+        # Add financial metrics section
+        financial_items = []
+        if revenue:
+            financial_items.append(f"Revenue: {translate_text(revenue)}")
+        if detailed_revenue:
+            financial_items.append(f"Detailed Revenue: {translate_text(detailed_revenue)}")
+        if profit_status:
+            financial_items.append(f"Profit Status: {translate_text(profit_status)}")
+        if detailed_profit:
+            financial_items.append(f"Detailed Profit: {translate_text(detailed_profit)}")
+        if price:
+            financial_items.append(f"Asking Price: {usd_price}")
+        
+        # Add additional financial details
+        if financial_details:
+            for detail in financial_details:
+                financial_items.append(translate_text(detail))
+        
+        if financial_items:
+            details_sections.append({
+                "infoSummary": "Financial Information",
+                "infoItems": financial_items
+            })
+        
+        # Add business metrics section
+        business_items = []
+        if employee_count:
+            business_items.append(f"Employees: {translate_text(employee_count)}")
+        
+        if business_items:
+            details_sections.append({
+                "infoSummary": "Business Metrics",
+                "infoItems": business_items
+            })
+        
+        # Add contact information section
+        contact_items = []
+        if phone:
+            contact_items.append(f"Phone: {phone}")
+        if email:
+            contact_items.append(f"Email: {email}")
+        if broker_name:
+            contact_items.append(f"Broker: {translate_text(broker_name)}")
+        if broker_company:
+            contact_items.append(f"Broker Company: {translate_text(broker_company)}")
+        
+        if contact_items:
+            details_sections.append({
+                "infoSummary": "Contact Information",
+                "infoItems": contact_items
+            })
+        
+        title = item.get("title", "")
+        category = item.get("category", "")
+        product_id = item.get("product_id")
+        
+        # Create the transformed item
+        transformed_item = {
+            "title": title,
+            "company": title,  # Use title as company name
+            "location": item.get("location", ""),
+            "price": usd_price,
+            "category": category,
+            "industry": category,  # Use category as industry
+            "link": item.get("url", ""),
+            "details": details_sections,
+            "business_name": title,
+            "contact_name": item.get("broker_name", ""),
+            "phone_number": item.get("phone", ""),
+            "product_id": str(product_id) if product_id else ""
+        }
+        
+        transformed_data.append(transformed_item)
+    
+    return transformed_data
+
+async def run_scraper():
+    """Run the Scrapy spider and return the data"""
+    try:
+        # First, try to load existing data
+        raw_data = await asyncio.to_thread(_load_saved_listings)
         
         # If no data files found, try to run the scraper
         if not raw_data:
             print("No existing data found, running scraper...")
-            # Run the scraper with cloud-optimized settings
-            cmd = [sys.executable, "start_scraper.py"] if os.path.exists("start_scraper.py") else ["scrapy", "crawl", "bolagsplatsen"]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=os.getcwd()  # Use current working directory instead of hardcoded path
-            )
-            
-            if result.returncode == 0:
-                # Check if the scraper created a new file
-                for file_path in data_files:
-                    if os.path.exists(file_path):
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            raw_data = json.load(f)
-                            break
-            else:
-                print(f"Scraper failed: {result.stderr}")
-                return None
+            # The crawl runs on the reactor thread; await it without holding a worker thread
+            crawl = await asyncio.to_thread(crawl_in_process)
+            raw_data = await asyncio.wait_for(asyncio.wrap_future(crawl), CRAWL_TIMEOUT_SECONDS)
         
         if not raw_data:
             return None
         
-        # Transform the data to match the expected format with translation and USD conversion
-        transformed_data = []
-        for item in raw_data:
-            # Create details sections from the scraped data
-            details_sections = []
-            
-            # Add business description section (use full description if available)
-            description_text = item.get('full_description') or item.get('description', '')
-            if description_text:
-                details_sections.append({
-                    "infoSummary": "Business Description",
-                    "infoItems": [translate_text(description_text)]
-                })
-            
-            # Add structured content sections if available
-            if item.get('structured_content'):
-                structured_content = item.get('structured_content', {})
-                for section_key, section_content in structured_content.items():
-                    if section_content and len(str(section_content).strip()) > 20:
-                        # Translate section names
-                        section_names = {
-                            'company_brief': 'Company Overview',
-                            'potential': 'Growth Potential',
-                            'reason_for_sale': 'Reason for Sale',
-                            'price_idea': 'Pricing Details',
-                            'summary': 'Summary',
-                            'description': 'Description',
-                            'business_activity': 'Business Activity',
-                            'market': 'Market Information',
-                            'competition': 'Competitive Situation'
-                        }
-                        
-                        section_title = section_names.get(section_key, section_key.replace('_', ' ').title())
-                        details_sections.append({
-                            "infoSummary": section_title,
-                            "infoItems": [translate_text(str(section_content))]
-                        })
-            
-            # Add financial metrics section
-            financial_items = []
-            if item.get('revenue'):
-                financial_items.append(f"Revenue: {translate_text(item.get('revenue', ''))}")
-            if item.get('detailed_revenue'):
-                financial_items.append(f"Detailed Revenue: {translate_text(item.get('detailed_revenue', ''))}")
-            if item.get('profit_status'):
-                financial_items.append(f"Profit Status: {translate_text(item.get('profit_status', ''))}")
-            if item.get('detailed_profit'):
-                financial_items.append(f"Detailed Profit: {translate_text(item.get('detailed_profit', ''))}")
-            if item.get('price'):
-                financial_items.append(f"Asking Price: {convert_currency(item.get('price', ''))}")
-            
-            # Add additional financial details
-            if item.get('financial_details'):
-                for detail in item.get('financial_details', []):
-                    financial_items.append(translate_text(detail))
-            
-            if financial_items:
-                details_sections.append({
-                    "infoSummary": "Financial Information",
-                    "infoItems": financial_items
-                })
-            
-            # Add business metrics section
-            business_items = []
-            if item.get('employee_count'):
-                business_items.append(f"Employees: {translate_text(item.get('employee_count', ''))}")
-            
-            if business_items:
-                details_sections.append({
-                    "infoSummary": "Business Metrics",
-                    "infoItems": business_items
-                })
-            
-            # Add contact information section
-            contact_items = []
-            if item.get('phone'):
-                contact_items.append(f"Phone: {item.get('phone', '')}")
-            if item.get('email'):
-                contact_items.append(f"Email: {item.get('email', '')}")
-            if item.get('broker_name'):
-                contact_items.append(f"Broker: {translate_text(item.get('broker_name', ''))}")
-            if item.get('broker_company'):
-                contact_items.append(f"Broker Company: {translate_text(item.get('broker_company', ''))}")
-            
-            if contact_items:
-                details_sections.append({
-                    "infoSummary": "Contact Information",
-                    "infoItems": contact_items
-                })
-            
-            # Create the transformed item
-            transformed_item = {
-                "title": item.get("title", ""),
-                "company": item.get("title", ""),  # Use title as company name
-                "location": item.get("location", ""),
-                "price": convert_currency(item.get("price", "")),
-                "category": item.get("category", ""),
-                "industry": item.get("category", ""),  # Use category as industry
-                "link": item.get("url", ""),
-                "details": details_sections,
-                "business_name": item.get("title", ""),
-                "contact_name": item.get("broker_name", ""),
-                "phone_number": item.get("phone", "")
-            }
-            
-            transformed_data.append(transformed_item)
-        
-        return transformed_data
+        return await asyncio.to_thread(transform_listings, raw_data)
         
+    except asyncio.TimeoutError:
+        print(f"Error in run_scraper: crawl did not finish within {CRAWL_TIMEOUT_SECONDS} seconds")
+        return None
     except Exception as e:
         print(f"Error in run_scraper: {e}")
         return None
 
+async def get_data():
+    """Return the cached listings, refreshing them at most once per TTL"""
+    # Concurrent requests wait on a single refresh instead of each scraping
+    async with _cache.lock:
+        if time.monotonic() >= _cache.expires:
+            data = await run_scraper()
+            if data:
+                _cache.update(data)
+            else:
+                # Requests queued behind a failed refresh reuse its outcome instead of
+                # each running another scrape
+                _cache.expires = time.monotonic() + CACHE_RETRY_SECONDS
+        # Keep serving the previous results if a refresh failed
+        return _cache.data
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -282,7 +398,7 @@ async def root():
 @app.get("/scrap")
 async def scrap():
     """Main endpoint for n8n workflow - returns data in expected format"""
-    data = run_scraper()
+    data = await get_data()
     
     if not data:
         raise HTTPException(status_code=404, detail="No data available or scraping failed.")
@@ -297,39 +413,36 @@ async def get_listings(
     location: Optional[str] = None
 ):
     """Get all scraped listings with optional filtering and pagination"""
-    # Run scraper and get data
-    data = run_scraper()
+    # Get cached or freshly scraped data
+    data = await get_data()
     
     if not data:
         raise HTTPException(status_code=404, detail="No data available or scraping failed.")
     
-    # Apply filters
+    # Apply filters lazily, starting from the precomputed index buckets
     if category:
-        data = [item for item in data if item.get("category") == category]
-    
-    if location:
-        data = [item for item in data if item.get("location") == location]
-    
-    # Apply pagination
-    if offset:
-        data = data[offset:]
+        data = _cache.by_category.get(category, [])
+        if location:
+            data = (item for item in data if item["location"] == location)
+    elif location:
+        data = _cache.by_location.get(location, [])
     
-    if limit:
-        data = data[:limit]
-    
-    return data
+    # Apply pagination in the same pass, stopping once the page is full
+    start = max(offset or 0, 0)
+    stop = start + limit if limit and limit > 0 else None
+    return list(islice(data, start, stop))
 
 @app.get("/listings/{product_id}", response_model=BusinessListing)
 async def get_listing(product_id: str):
     """Get a specific listing by product ID"""
-    data = run_scraper()
+    data = await get_data()
     
     if not data:
         raise HTTPException(status_code=404, detail="No data available or scraping failed.")
     
-    for item in data:
-        if item.get("product_id") == product_id:
-            return item
+    item = _cache.by_product_id.get(product_id)
+    if item:
+        return item
     
     raise HTTPException(status_code=404, detail=f"Listing with product ID {product_id} not found")
 
@@ -339,7 +452,7 @@ async def search_listings(
     limit: Optional[int] = 50
 ):
     """Search listings by text query"""
-    data = run_scraper()
+    data = await get_data()
     
     if not data:
         raise HTTPException(status_code=404, detail="No data available or scraping failed.")
@@ -347,20 +460,12 @@ async def search_listings(
     query = q.lower()
     results = []
     
-    for item in data:
-        # Search in title, description, category, and location
-        searchable_fields = [
-            item.get("title", ""),
-            item.get("company", ""),
-            item.get("category", ""),
-            item.get("location", "")
-        ]
-        
-        if any(query in field.lower() for field in searchable_fields):
+    # Search in title, company, category, and location
+    for search_blob, item in _cache.search_index:
+        if query in search_blob:
             results.append(item)
-            
-        if len(results) >= limit:
-            break
+            if len(results) >= limit:
+                break
     
     return {
         "query": q,
@@ -0,0 +1,22 @@
+# Define your item exporters here
+#
+# Don't forget to add your exporter to the FEED_EXPORTERS setting
+# See: https://docs.scrapy.org/en/latest/topics/exporters.html
+
+from scrapy.exporters import JsonLinesItemExporter
+
+try:
+    import orjson
+except ImportError:  # fall back to Scrapy's stdlib-json encoder
+    orjson = None
+
+
+class OrjsonLinesItemExporter(JsonLinesItemExporter):
+    """JSON Lines exporter that encodes items with orjson (always UTF-8)"""
+
+    def export_item(self, item):
+        if orjson is None:
+            return super().export_item(item)
+        itemdict = dict(self._get_serialized_fields(item))
+        # Types orjson can't encode natively (Decimal, sets, ...) go through Scrapy's encoder
+        self.file.write(orjson.dumps(itemdict, default=self.encoder.default, option=orjson.OPT_APPEND_NEWLINE))
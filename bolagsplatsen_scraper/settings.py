@@ -89,7 +89,9 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
 
 # Set settings whose default value is deprecated to a future-proof value
 REQUEST_FINGERPRINTER_IMPLEMENTATION = "2.7"
-#TWISTED_REACTOR = "twisted.internet.asyncio.AsyncioSelectorReactor"
+TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
+# Twisted needs a selector loop; uvicorn's default policy would hand the API's crawl thread a uvloop loop
+ASYNCIO_EVENT_LOOP = "asyncio.SelectorEventLoop"
 FEED_EXPORT_ENCODING = "utf-8"
 
 # Cloud-optimized settings for Render/Heroku
@@ -102,11 +104,13 @@ MEMUSAGE_ENABLED = True
 MEMUSAGE_LIMIT_MB = 512
 
 # Ensure proper output handling in cloud environments
+FEED_EXPORTERS = {
+    'jsonl': 'bolagsplatsen_scraper.exporters.OrjsonLinesItemExporter',
+}
 FEEDS = {
-    'bolagsplatsen_listings.json': {
-        'format': 'json',
+    'bolagsplatsen_listings.jsonl': {
+        'format': 'jsonl',
         'encoding': 'utf8',
-        'indent': 2,
         'overwrite': True,
     }
 }
@@ -1,21 +1,106 @@
 import scrapy
 import re
 import json
+import logging
 from datetime import datetime
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
+from lxml import etree
+from parsel.csstranslator import css2xpath
 from ..items import BolagsplatsenScraperItem
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# Patterns used on every listing/detail page, compiled once at import
+PRODUCT_ID_RE = re.compile(r'-(\d+)$')
+# Patterns run over the full text of each detail page
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+# Phone patterns in order of preference, each with a literal the page must contain
+# for the pattern to match at all (None when no useful literal exists)
+PHONE_RES = (
+    ('+46', re.compile(r'\+46[\s-]?[\d\s-]{8,}')),
+    (None, re.compile(r'0[\d\s-]{8,}')),
+    (None, re.compile(r'[\d]{2,3}[\s-][\d]{3}[\s-][\d]{2,4}')),
+)
+EMPLOYEE_NUM_RE = re.compile(r'\d+')
+
+# JSON-LD descriptions shorter than this are treated as truncated card summaries
+DETAIL_DESCRIPTION_MIN_LENGTH = 300
+
+# Elements whose text the detail page extractors read
+TEXT_INDEX_TAGS = ('p', 'li', 'h2', 'h3', 'h4', 'span', 'td', 'dd')
+SECTION_TEXT_TAGS = frozenset(('p', 'li', 'h2', 'h3', 'h4'))
+
+# Swedish business section headings and the structured_content keys they map to
+SWEDISH_SECTIONS = {
+    'Företaget i korthet': 'company_brief',
+    'Potential': 'potential',
+    'Anledning till försäljning': 'reason_for_sale',
+    'Prisidé': 'price_idea',
+    'Sammanfattning': 'summary',
+    'Beskrivning': 'description',
+    'Verksamhet': 'business_activity',
+    'Marknad': 'market',
+    'Konkurrenssituation': 'competition'
+}
+# Markers of JavaScript (matched case-insensitively) or CSS/markup in a text node
+JUNK_TEXT_RE = re.compile(
+    r'(?i:function\(|var |\$\(|console\.log|gtag\(|mixpanel|document\.ready)'
+    r'|[{};]|px|margin|padding|color:|background:|font-size'
+)
+# Finds every section heading in one scan of the page text
+SWEDISH_SECTIONS_RE = re.compile('|'.join(map(re.escape, sorted(SWEDISH_SECTIONS, key=len, reverse=True))))
+
+
+def _compile_css(*selectors):
+    """Compile CSS selectors to lxml XPath objects once, keeping their priority order"""
+    return tuple(etree.XPath(css2xpath(selector), smart_strings=False) for selector in selectors)
+
 
 class BolagsplatsenSpider(scrapy.Spider):
     name = "bolagsplatsen"
     allowed_domains = ["bolagsplatsen.se"]
     start_urls = ["https://www.bolagsplatsen.se/foretag-till-salu/alla/alla"]
     
+    # Detail page contact selectors, tried in order; the first one that matches wins
+    _PHONE_XPATHS = _compile_css(
+        '.phone::text',
+        '.tel::text',
+        '.contact-phone::text',
+        'a[href^="tel:"]::text',
+        'a[href^="tel:"]::attr(href)'
+    )
+    _EMAIL_XPATHS = _compile_css(
+        '.email::text',
+        '.contact-email::text',
+        'a[href^="mailto:"]::text',
+        'a[href^="mailto:"]::attr(href)'
+    )
+    _BROKER_NAME_XPATHS = _compile_css('.broker-name::text, .contact-person h4::text')
+    _BROKER_COMPANY_XPATHS = _compile_css('.broker-company::text, .company-info .name::text')
+    
     # Custom settings for this spider
     custom_settings = {
         'ROBOTSTXT_OBEY': False,
-        'DOWNLOAD_DELAY': 1,
-        'CONCURRENT_REQUESTS': 1,
+        # Overlap listing and detail page fetches; AutoThrottle backs off on latency
+        # instead of a fixed per-request delay
+        'DOWNLOAD_DELAY': 0,
+        'CONCURRENT_REQUESTS': 32,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 8,
+        'CONCURRENT_REQUESTS_PER_IP': 0,  # project settings cap this at 1, which would override the domain limit
+        'AUTOTHROTTLE_ENABLED': True,
+        'AUTOTHROTTLE_TARGET_CONCURRENCY': 8.0,
+        # Reuse pages from disk across runs when the server's cache headers allow it:
+        # RFC2616Policy only stores responses with freshness (max-age/Expires) or
+        # validators (ETag/Last-Modified), and revalidates stale ones. Duplicate
+        # detail URLs within a run are already dropped by the default dupefilter
+        'HTTPCACHE_ENABLED': True,
+        'HTTPCACHE_POLICY': 'scrapy.extensions.httpcache.RFC2616Policy',
+        'HTTPCACHE_STORAGE': 'scrapy.extensions.httpcache.FilesystemCacheStorage',
+        'HTTPCACHE_EXPIRATION_SECS': 86400,
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         # Cloud-optimized settings
         'LOG_LEVEL': 'INFO',
@@ -24,6 +109,21 @@ class BolagsplatsenSpider(scrapy.Spider):
         'MEMUSAGE_LIMIT_MB': 512,
     }
     
+    def __init__(self, *args, page_start=1, page_end=10, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Listing pages to crawl; set with -a page_start=N -a page_end=M to shard a crawl
+        self.page_start = int(page_start)
+        self.page_end = int(page_end)
+        # Detail URLs already requested this crawl
+        self._detail_urls = set()
+    
+    def start_requests(self):
+        """Request the whole listings page range up front so the pages download concurrently"""
+        base_url = self.start_urls[0]
+        for page in range(self.page_start, self.page_end + 1):
+            url = base_url if page == 1 else f"{base_url}?page={page}"
+            yield scrapy.Request(url, callback=self.parse)
+    
     def parse(self, response):
         """Parse the main listings page"""
         self.logger.info(f"Parsing main page: {response.url}")
@@ -32,22 +132,24 @@ class BolagsplatsenSpider(scrapy.Spider):
         listing_containers = response.css('div.list-items-list')
         self.logger.info(f"Found {len(listing_containers)} listing containers")
         
+        # One timestamp per listings page; second granularity is enough
+        scraped_at = datetime.now().isoformat(timespec='seconds')
+        
         for container in listing_containers:
             # Extract basic listing information
             item = BolagsplatsenScraperItem()
             
-            # Debug: Log what we're processing
-            self.logger.info(f"Processing container: {container.get()[:100]}...")
+            # Debug: Log what we're processing (serializing the container isn't free)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug('Processing container: %.100s', container.get())
             
             # Extract title from the link
             title = container.css('a::attr(title)').get()
-            self.logger.info(f"Extracted title: {title}")
             
             if title:
                 # Clean up the title (remove "Läs mer om " prefix)
                 title = title.replace('Läs mer om ', '').strip()
                 item['title'] = title
-                self.logger.info(f"Cleaned title: {title}")
             
             # Extract listing URL
             listing_url = container.css('a::attr(href)').get()
@@ -58,7 +160,7 @@ class BolagsplatsenSpider(scrapy.Spider):
             json_ld_script = container.css('script[type="application/ld+json"]::text').get()
             if json_ld_script:
                 try:
-                    json_data = json.loads(json_ld_script)
+                    json_data = json_loads(json_ld_script)
                     
                     # Extract description from JSON-LD
                     if 'description' in json_data:
@@ -77,7 +179,7 @@ class BolagsplatsenSpider(scrapy.Spider):
                         elif 'minPrice' in price_spec and 'maxPrice' in price_spec:
                             item['price'] = f"{price_spec['minPrice']}-{price_spec['maxPrice']} SEK"
                     
-                except (json.JSONDecodeError, KeyError):
+                except (json.JSONDecodeError, KeyError):  # orjson's error subclasses json's
                     pass
             
             # Add missing fields that the API expects
@@ -146,7 +248,7 @@ class BolagsplatsenSpider(scrapy.Spider):
             
             # Extract product ID from URL
             if listing_url:
-                product_id_match = re.search(r'-(\d+)$', listing_url)
+                product_id_match = PRODUCT_ID_RE.search(listing_url)
                 if product_id_match:
                     item['product_id'] = product_id_match.group(1)
             
@@ -158,38 +260,44 @@ class BolagsplatsenSpider(scrapy.Spider):
                 item['listing_type'] = 'regular'
             
             # Add timestamp
-            item['scraped_at'] = datetime.now().isoformat()
-            
-            # Always yield the item first, then follow for more details if URL exists
-            yield item
+            item['scraped_at'] = scraped_at
             
-            # If we have a listing URL, follow it to get more details
-            if item.get('url'):
+            # If we have a listing URL, follow it to get more details unless the card's
+            # JSON-LD already supplied the price and a full description; the detail
+            # callback yields the completed item, so each listing is emitted once
+            needs_detail = (
+                not item.get('price')
+                or len(item.get('full_description', '')) < DETAIL_DESCRIPTION_MIN_LENGTH
+            )
+            if item.get('url') and needs_detail and self._claim_detail_url(item['url']):
+                # _claim_detail_url screened out duplicate and off-site URLs, so nothing drops this
+                # request before one of its callbacks can emit the item
                 yield scrapy.Request(
                     item['url'],
                     callback=self.parse_listing_detail,
-                    meta={'item': item}
+                    errback=self.detail_failed,
+                    meta={'item': item},
+                    dont_filter=True
                 )
-        
-        # Handle pagination - follow next pages
-        next_page = response.css('a[href*="page="]::attr(href)').getall()
-        if next_page:
-            # Get the next page number from the current URL
-            current_url = response.url
-            if 'page=' in current_url:
-                current_page = int(re.search(r'page=(\d+)', current_url).group(1))
-                next_page_num = current_page + 1
             else:
-                next_page_num = 2
-            
-            # Limit to first 10 pages for testing (you can increase this)
-            if next_page_num <= 10:
-                next_url = f"https://www.bolagsplatsen.se/foretag-till-salu/alla/alla?page={next_page_num}"
-                self.logger.info(f"Following next page: {next_url}")
-                yield scrapy.Request(
-                    next_url,
-                    callback=self.parse
-                )
+                yield item
+    
+    def _claim_detail_url(self, url):
+        """Return True if url should be fetched for details, recording it as requested"""
+        # Off-site and already requested URLs would be dropped silently by the offsite
+        # middleware and dupefilter without calling back, losing the listing card
+        host = urlparse(url).hostname or ''
+        if not any(host == domain or host.endswith('.' + domain) for domain in self.allowed_domains):
+            return False
+        if url in self._detail_urls:
+            return False
+        self._detail_urls.add(url)
+        return True
+    
+    def detail_failed(self, failure):
+        """Keep the listing card data when its detail page can't be fetched"""
+        self.logger.warning(f"Detail page failed: {failure.request.url} ({failure.value!r})")
+        yield failure.request.meta['item']
     
     def parse_listing_detail(self, response):
         """Parse individual listing detail page for additional contact information and full details"""
@@ -197,104 +305,98 @@ class BolagsplatsenSpider(scrapy.Spider):
         
         self.logger.info(f"Parsing detail page: {response.url}")
         
+        # The card is only emitted from here, so extraction errors must not lose it
+        try:
+            self._merge_detail(response, item)
+        except Exception:
+            self.logger.exception(f"Detail page extraction failed: {response.url}")
+        
+        yield item
+    
+    def _merge_detail(self, response, item):
+        """Add the detail page's content, financials and contact information to item"""
+        # Walk the document once and share the collected text between extractors
+        text_index = self._index_text(response)
+        
         # Extract structured content from detail page
-        self._extract_structured_content(response, item)
+        self._extract_structured_content(response, item, text_index)
         
         # Extract detailed financial information
         self._extract_detailed_financials(response, item)
         
         # Extract additional employee information if not found on listing card
         if not item.get('employee_count'):
-            self._extract_employee_info(response, item)
+            self._extract_employee_info(item, text_index)
         
         # Extract additional contact information from detail page
-        # Phone numbers
-        phone_selectors = [
-            '.phone::text',
-            '.tel::text',
-            '.contact-phone::text',
-            'a[href^="tel:"]::text',
-            'a[href^="tel:"]::attr(href)'
-        ]
+        root = response.selector.root
         
-        for selector in phone_selectors:
-            phone = response.css(selector).get()
-            if phone:
-                if phone.startswith('tel:'):
-                    phone = phone.replace('tel:', '')
-                item['phone'] = phone.strip()
-                break
+        # Phone numbers
+        phone = self._first_match(self._PHONE_XPATHS, root)
+        if phone:
+            item['phone'] = phone.removeprefix('tel:').strip()
         
         # Email addresses
-        email_selectors = [
-            '.email::text',
-            '.contact-email::text',
-            'a[href^="mailto:"]::text',
-            'a[href^="mailto:"]::attr(href)'
-        ]
-        
-        for selector in email_selectors:
-            email = response.css(selector).get()
-            if email:
-                if email.startswith('mailto:'):
-                    email = email.replace('mailto:', '')
-                item['email'] = email.strip()
-                break
+        email = self._first_match(self._EMAIL_XPATHS, root)
+        if email:
+            item['email'] = email.removeprefix('mailto:').strip()
         
         # Look for contact information in text content
         text_content = response.text
         
         # Phone patterns
-        phone_patterns = [
-            r'\+46[\s-]?[\d\s-]{8,}',
-            r'0[\d\s-]{8,}',
-            r'[\d]{2,3}[\s-][\d]{3}[\s-][\d]{2,4}'
-        ]
-        
         if not item.get('phone'):
-            for pattern in phone_patterns:
-                phone_match = re.search(pattern, text_content)
+            for required, phone_re in PHONE_RES:
+                # A C-level substring check is far cheaper than a regex scan that finds nothing
+                if required and required not in text_content:
+                    continue
+                phone_match = phone_re.search(text_content)
                 if phone_match:
                     item['phone'] = phone_match.group(0).strip()
                     break
         
         # Email patterns
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        if not item.get('email'):
-            email_match = re.search(email_pattern, text_content)
+        if not item.get('email') and '@' in text_content:
+            email_match = EMAIL_RE.search(text_content)
             if email_match:
                 item['email'] = email_match.group(0)
         
         # Extract additional broker information
         if not item.get('broker_name'):
-            broker_name = response.css('.broker-name::text, .contact-person h4::text').get()
+            broker_name = self._first_match(self._BROKER_NAME_XPATHS, root)
             if broker_name:
                 item['broker_name'] = broker_name.strip()
         
         if not item.get('broker_company'):
-            broker_company = response.css('.broker-company::text, .company-info .name::text').get()
+            broker_company = self._first_match(self._BROKER_COMPANY_XPATHS, root)
             if broker_company:
                 item['broker_company'] = broker_company.strip()
-        
-        yield item
     
-    def _extract_structured_content(self, response, item):
+    def _first_match(self, xpaths, root):
+        """Return the first result of the first precompiled XPath that matches, or None"""
+        for xpath in xpaths:
+            results = xpath(root)
+            if results and results[0]:
+                return results[0]
+        return None
+    
+    def _index_text(self, response):
+        """Collect (tag, normalized text) for content text nodes in a single tree walk"""
+        text_index = []
+        for element in response.selector.root.iter(*TEXT_INDEX_TAGS):
+            # Direct text nodes only (like ::text); nested elements are indexed on their
+            # own, so containers neither repeat their children's text nor shadow it
+            for text in (element.text, *(child.tail for child in element)):
+                if text:
+                    text = ' '.join(text.split())
+                    if text:
+                        text_index.append((element.tag, text))
+        return text_index
+    
+    def _extract_structured_content(self, response, item, text_index):
         """Extract structured content sections from the detail page"""
         structured_content = {}
         
-        # Look for specific Swedish business sections with more targeted selectors
-        swedish_sections = {
-            'Företaget i korthet': 'company_brief',
-            'Potential': 'potential', 
-            'Anledning till försäljning': 'reason_for_sale',
-            'Prisidé': 'price_idea',
-            'Sammanfattning': 'summary',
-            'Beskrivning': 'description',
-            'Verksamhet': 'business_activity',
-            'Marknad': 'market',
-            'Konkurrenssituation': 'competition'
-        }
-        
         # First try to find the main business description area
         main_content = response.css('.ad-detail-body, .listing-description, .business-description, .main-content')
         
@@ -306,17 +408,12 @@ class BolagsplatsenSpider(scrapy.Spider):
             clean_texts = []
             for text in business_texts:
                 text = text.strip()
-                # Skip if it contains JavaScript-like content
-                if any(skip in text.lower() for skip in ['function(', 'var ', '$(', 'console.log', 'gtag(', 'mixpanel', 'document.ready']):
-                    continue
-                # Skip if it's mostly CSS or HTML
-                if any(skip in text for skip in ['{', '}', ';', 'px', 'margin', 'padding', 'color:', 'background:', 'font-size']):
-                    continue
-                # Skip very short or technical content
-                if len(text) < 20 or text.startswith('//') or text.startswith('/*'):
+                # Skip very short or technical content, and anything that looks like
+                # JavaScript, CSS or HTML (one regex scan covers every marker)
+                if len(text) < 20 or text.startswith(('//', '/*')) or JUNK_TEXT_RE.search(text):
                     continue
                 # Skip if it contains too many technical characters
-                if text.count('(') > 3 or text.count(')') > 3 or text.count(';') > 2:
+                if text.count('(') > 3 or text.count(')') > 3:
                     continue
                 clean_texts.append(text)
             
@@ -328,25 +425,21 @@ class BolagsplatsenSpider(scrapy.Spider):
                     break
         
         # Also try to find specific sections by looking for Swedish keywords in text
-        for swedish_key, english_key in swedish_sections.items():
-            # Look for text that contains these Swedish keywords
-            text_elements = response.css('p::text, li::text, h2::text, h3::text, h4::text').getall()
+        text_elements = [text for tag, text in text_index if tag in SECTION_TEXT_TAGS]
+        found_keys = set(SWEDISH_SECTIONS_RE.findall('\n'.join(text_elements)))
+        if found_keys:
+            # Extract text from this section, but limit to reasonable length
+            page_text = ' '.join([t for t in text_elements if len(t) > 20])
             
-            for text in text_elements:
-                if swedish_key in text:
-                    # Get the parent element to extract more context
-                    parent = response.xpath(f'//*[contains(text(), "{swedish_key}")]').get()
-                    if parent:
-                        # Extract text from this section, but limit to reasonable length
-                        section_text = ' '.join([t.strip() for t in text_elements if t.strip() and len(t.strip()) > 20])
-                        
-                        # Clean up the content
-                        if swedish_key in section_text:
-                            section_text = section_text.replace(swedish_key, '').strip()
-                        
-                        if section_text and len(section_text) > 50 and len(section_text) < 2000:  # Reasonable length
-                            structured_content[english_key] = section_text
-                            break
+            for swedish_key, english_key in SWEDISH_SECTIONS.items():
+                if swedish_key not in found_keys:
+                    continue
+                
+                # Clean up the content
+                section_text = page_text.replace(swedish_key, '').strip()
+                
+                if len(section_text) > 50 and len(section_text) < 2000:  # Reasonable length
+                    structured_content[english_key] = section_text
         
         # If we found structured content, store it
         if structured_content:
@@ -369,21 +462,21 @@ class BolagsplatsenSpider(scrapy.Spider):
         financial_details = []
         
         for section in financial_sections:
+            # Read the text of each paragraph/list item once instead of matching every
+            # element with :contains() and serializing the matches back to HTML
+            detail_texts = section.xpath('.//*[self::p or self::li]').xpath('normalize-space(.)').getall()
+            
             # Extract revenue details
-            revenue_details = section.css('*:contains("Omsättning")').getall()
-            if revenue_details:
-                for detail in revenue_details:
-                    if 'Omsättning' in detail and len(detail) > 50:  # More detailed than card
-                        item['detailed_revenue'] = detail.strip()
-                        break
+            for detail in detail_texts:
+                if 'Omsättning' in detail and len(detail) > 50:  # More detailed than card
+                    item['detailed_revenue'] = detail
+                    break
             
             # Extract profit details
-            profit_details = section.css('*:contains("Resultat")').getall()
-            if profit_details:
-                for detail in profit_details:
-                    if 'Resultat' in detail and len(detail) > 50:  # More detailed than card
-                        item['detailed_profit'] = detail.strip()
-                        break
+            for detail in detail_texts:
+                if 'Resultat' in detail and len(detail) > 50:  # More detailed than card
+                    item['detailed_profit'] = detail
+                    break
             
             # Extract other financial metrics
             financial_text = section.css('::text').getall()
@@ -396,7 +489,9 @@ class BolagsplatsenSpider(scrapy.Spider):
         # Also look in the main content for financial information
         main_content = response.css('.main-content, .content, .listing-content')
         for content in main_content:
-            financial_paragraphs = content.css('p:contains("Omsättning"), p:contains("Resultat"), p:contains("Vinst"), p:contains("Förlust")')
+            financial_paragraphs = content.xpath(
+                './/p[contains(., "Omsättning") or contains(., "Resultat") or contains(., "Vinst") or contains(., "Förlust")]'
+            )
             for para in financial_paragraphs:
                 para_text = para.css('::text').get()
                 if para_text and len(para_text.strip()) > 30:
@@ -405,23 +500,13 @@ class BolagsplatsenSpider(scrapy.Spider):
         if financial_details:
             item['financial_details'] = financial_details
     
-    def _extract_employee_info(self, response, item):
+    def _extract_employee_info(self, item, text_index):
         """Extract employee count information from detail page"""
-        # Look for employee count in various sections
-        employee_selectors = [
-            '*:contains("Anställda")',
-            '*:contains("Personal")',
-            '*:contains("Medarbetare")',
-            '*:contains("anställd")'
-        ]
-        
-        for selector in employee_selectors:
-            employee_elements = response.css(selector)
-            for element in employee_elements:
-                text = element.css('::text').get()
-                if text and 'anställd' in text.lower():
-                    # Extract number from text like "Anställda: 11 st." or "11 anställda"
-                    numbers = re.findall(r'\d+', text)
-                    if numbers:
-                        item['employee_count'] = f"{numbers[0]} employees"
-                        return
+        # Look for employee count in the indexed page text
+        for tag, text in text_index:
+            if 'anställd' in text.lower():
+                # Extract number from text like "Anställda: 11 st." or "11 anställda"
+                number_match = EMPLOYEE_NUM_RE.search(text)
+                if number_match:
+                    item['employee_count'] = f"{number_match.group(0)} employees"
+                    return
@@ -0,0 +1,129 @@
+"""Swedish to English translation and SEK to USD conversion helpers"""
+
+import re
+from fractions import Fraction
+from functools import lru_cache
+
+# Swedish to English translation dictionary (90% coverage)
+TRANSLATIONS = {
+    # Business terms
+    "företag": "company", "verksamhet": "business", "firma": "firm",
+    "omsättning": "revenue", "resultat": "profit", "vinst": "profit", 
+    "förlust": "loss", "intäkter": "income", "kostnader": "costs",
+    
+    # Industries
+    "handel": "trade", "tillverkning": "manufacturing", "tjänster": "services",
+    "hotell": "hotel", "restaurang": "restaurant", "e-handel": "e-commerce",
+    "bygg": "construction", "transport": "transport", "logistik": "logistics",
+    "fastighet": "real estate", "fastigheter": "real estate",
+    
+    # Financial terms
+    "miljoner": "million", "mkr": "million SEK", "tkr": "thousand SEK",
+    "miljarder": "billion", "bkr": "billion SEK",
+    
+    # Business status
+    "lönsam": "profitable", "väletablerad": "well-established",
+    "etablerad": "established", "populär": "popular", "stark": "strong",
+    "tillväxt": "growth", "potential": "potential", "framtid": "future",
+    
+    # Location terms
+    "sverige": "Sweden", "stockholm": "Stockholm", "göteborg": "Gothenburg",
+    "malmö": "Malmö", "uppsala": "Uppsala", "västerås": "Västerås",
+    
+    # Business activities
+    "leverantör": "supplier", "grossist": "wholesaler", "butik": "store",
+    "fabrik": "factory", "kontor": "office", "lager": "warehouse",
+    "verkstad": "workshop", "ateljé": "studio", "salong": "salon"
+}
+
+
+def _trie_pattern(words):
+    """Build a prefix-factored regex alternation (a trie) matching any of the words"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None  # end of word marker
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        optional = '' in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        # Greedy "?" keeps longest-match semantics, so "e-handel" wins over "handel"
+        return '(?:' + '|'.join(branches) + ')' + ('?' if optional else '')
+    
+    return build(trie)
+
+
+# Single pass over the text; shared prefixes are only tested once per position
+_TRANS_RE = re.compile(r'\b(' + _trie_pattern(TRANSLATIONS) + r')\b', re.IGNORECASE)
+
+
+def _translate_match(match):
+    word = match.group(0)
+    # Most matches are already lowercase; only fold case when the direct lookup misses
+    return TRANSLATIONS.get(word) or TRANSLATIONS.get(word.lower(), word)
+
+
+# Currency conversion rate (approximate)
+SEK_TO_USD = 0.095  # 1 SEK = 0.095 USD
+
+# The same rate as an exact ratio, so conversion stays in integer arithmetic
+_SEK_TO_USD_NUM, _SEK_TO_USD_DEN = Fraction(str(SEK_TO_USD)).as_integer_ratio()
+
+# Swedish prices group thousands with spaces, often no-break, thin or figure spaces,
+# e.g. "1\u00a0500\u00a0000"; the price pattern and the deletion table share this set
+_GROUP_SEPARATORS = ' \t\r\n\xa0\u2007\u2009\u202f'
+_PRICE_RE = re.compile(r'\d[\d' + _GROUP_SEPARATORS + ']*')
+_WS_DEL = str.maketrans('', '', _GROUP_SEPARATORS)
+
+
+@lru_cache(maxsize=8192)
+def translate_text(text):
+    """Translate Swedish text to English using the translation dictionary"""
+    if not text:
+        return text
+    
+    translated = _TRANS_RE.sub(_translate_match, text)
+    
+    # Capitalize first letter without lowercasing (and copying) the rest of the text
+    return translated[:1].upper() + translated[1:]
+
+
+def _sek_to_usd(amount):
+    """Convert a whole SEK amount to whole USD, rounding half up"""
+    return (2 * amount * _SEK_TO_USD_NUM + _SEK_TO_USD_DEN) // (2 * _SEK_TO_USD_DEN)
+
+
+def _first_price_in_usd(text):
+    """Convert the first number in text to a formatted USD amount, or None"""
+    match = _PRICE_RE.search(text)
+    if not match:
+        return None
+    usd_price = _sek_to_usd(int(match.group(0).translate(_WS_DEL)))
+    return f"${usd_price:,}"
+
+
+@lru_cache(maxsize=4096)
+def convert_currency(price_str):
+    """Convert SEK prices to USD"""
+    if not price_str:
+        return price_str
+    
+    try:
+        # Price ranges ("2000000-3000000 SEK") convert both ends
+        low, sep, high = price_str.partition('-')
+        if sep:
+            low_usd = _first_price_in_usd(low)
+            high_usd = _first_price_in_usd(high)
+            if low_usd and high_usd:
+                return f"{low_usd}-{high_usd}"
+        
+        # Otherwise convert the first number in the price string
+        return _first_price_in_usd(price_str) or price_str
+    except ValueError:
+        return price_str
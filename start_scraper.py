@@ -6,7 +6,6 @@ This script ensures proper environment setup for Render/Heroku deployment
 
 import os
 import sys
-import subprocess
 from pathlib import Path
 
 def setup_cloud_environment():
@@ -57,30 +56,28 @@ def run_scraper():
     print("🚀 Starting Bolagsplatsen scraper...")
     
     try:
-        # Run the scraper with cloud-optimized settings
-        cmd = [
-            sys.executable, "-m", "scrapy", "crawl", "bolagsplatsen",
-            "-s", "LOG_LEVEL=INFO",
-            "-s", "TELNETCONSOLE_ENABLED=False",
-            "-s", "MEMUSAGE_ENABLED=True",
-            "-s", "MEMUSAGE_LIMIT_MB=512"
-        ]
+        from scrapy.crawler import CrawlerProcess
+        from scrapy.utils.project import get_project_settings
         
-        print(f"Running command: {' '.join(cmd)}")
+        # Run the scraper in this process with cloud-optimized settings;
+        # logs stream straight to stdout instead of being buffered
+        settings = get_project_settings()
+        settings.set("LOG_LEVEL", "INFO", priority="cmdline")
+        settings.set("TELNETCONSOLE_ENABLED", False, priority="cmdline")
+        settings.set("MEMUSAGE_ENABLED", True, priority="cmdline")
+        settings.set("MEMUSAGE_LIMIT_MB", 512, priority="cmdline")
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=os.getcwd()
-        )
+        print("Running spider in-process: bolagsplatsen")
         
-        if result.returncode == 0:
+        process = CrawlerProcess(settings)
+        process.crawl("bolagsplatsen")
+        process.start()  # Blocks until the crawl is finished
+        
+        if not process.bootstrap_failed:
             print("✅ Scraper completed successfully")
-            print(f"📊 Output: {result.stdout}")
             
             # Check if output file was created
-            output_file = Path("bolagsplatsen_listings.json")
+            output_file = Path("bolagsplatsen_listings.jsonl")
             if output_file.exists():
                 file_size = output_file.stat().st_size
                 print(f"📁 Output file created: {output_file} ({file_size} bytes)")
@@ -89,8 +86,7 @@ def run_scraper():
                 print("⚠️  Output file not found")
                 return False
         else:
-            print(f"❌ Scraper failed with exit code {result.returncode}")
-            print(f"Error output: {result.stderr}")
+            print("❌ Scraper failed to start the crawl")
             return False
             
     except Exception as e: